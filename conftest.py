@@ -1,8 +1,13 @@
 """Pytest configuration"""
 
+import sys
 import pytest
 from pathlib import Path
 
+# Make the repository root importable once per session so individual test
+# modules don't need their own sys.path setup.
+sys.path.insert(0, str(Path(__file__).parent))
+
 
 def pytest_ignore_collect(collection_path, config):
     """Ignore collection from core/batch_robustness.py"""
@@ -7,6 +7,8 @@ from core.perceptual_hash import load_video_frames, extract_perceptual_features,
 # Tell pytest not to collect this module
 __test__ = False
 
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv')
+
 def compress_and_compare_video(video_path, max_frames=None, crf=28):
     compressed_path = video_path + f".crf{crf}.mp4"
     # Step 1: Load original video and compute hash
@@ -35,10 +37,14 @@ def compress_and_compare_video(video_path, max_frames=None, crf=28):
 
 def batch_test_videos(directory, max_frames=None, crf=28):
     results = []
-    for fname in os.listdir(directory):
-        if not fname.lower().endswith(('.mp4', '.avi', '.mov', '.mkv')):
-            continue
-        video_path = os.path.join(directory, fname)
+    # scandir reports file type without an extra stat per entry; sorted so
+    # runs over the same directory report in a stable order
+    with os.scandir(directory) as entries:
+        videos = sorted(
+            (entry.name, entry.path) for entry in entries
+            if entry.name.lower().endswith(VIDEO_EXTENSIONS) and entry.is_file()
+        )
+    for fname, video_path in videos:
         print(f"Testing {fname}...")
         res = compress_and_compare_video(video_path, max_frames, crf)
         if res is not None:
@@ -21,6 +21,16 @@ from datetime import datetime, timezone
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import ed25519
 
+
+# Canonical JSON encoder for signed payloads (sorted keys, no whitespace).
+# Built once so sign and verify don't construct a fresh encoder per call.
+_CANONICAL_ENCODER = json.JSONEncoder(sort_keys=True, separators=(',', ':'))
+
+
+def _canonical_bytes(claim: Dict[str, Any]) -> bytes:
+    """Serialize a claim to the exact bytes that are signed"""
+    return _CANONICAL_ENCODER.encode(claim).encode('utf-8')
+
 # Assuming this import is intended based on the diff, despite the partial line.
 # If this is incorrect, please clarify.
 from .perceptual_hash import compute_match_score
@@ -35,15 +45,28 @@ class SigilIdentity:
     DEFAULT_KEY_DIR = Path.home() / ".sigil" / "keys"
     DEFAULT_PRIVATE_KEY = "id_ed25519"
     DEFAULT_PUBLIC_KEY = "id_ed25519.pub"
+    KEY_FORMATS = ("openssh", "raw")
 
-    def __init__(self, key_dir: Optional[str] = None, private_key_name: Optional[str] = None):
+    def __init__(
+        self,
+        key_dir: Optional[str] = None,
+        private_key_name: Optional[str] = None,
+        key_format: str = "openssh"
+    ):
         """
         Initialize Sigil Identity.
         
         Args:
             key_dir: Directory to store keys (default: ~/.sigil/keys)
             private_key_name: Name of private key file (default: id_ed25519)
+            key_format: On-disk key format. "openssh" (default) writes
+                OpenSSH-compatible files; "raw" writes the bare 32-byte
+                private and public keys for host-local identities.
         """
+        if key_format not in self.KEY_FORMATS:
+            raise ValueError(f"Unsupported key format: {key_format}")
+        self.key_format = key_format
+
         if key_dir:
             self.key_dir = Path(key_dir)
         else:
@@ -74,31 +97,53 @@ class SigilIdentity:
         """
         if self.private_key_path.exists() and not force:
             raise FileExistsError(f"Key already exists at {self.private_key_path}")
-            
+
+        return self._save_keys(ed25519.Ed25519PrivateKey.generate())
+
+    def _generate_from_seed(self, seed: bytes, force: bool = False) -> Tuple[str, str]:
+        """
+        Derive a deterministic Ed25519 key pair from a 32-byte seed.
+
+        Internal helper for tests: skips the CSPRNG draw so fixtures are
+        reproducible. Production identities always come from generate_keys().
+        """
+        if self.private_key_path.exists() and not force:
+            raise FileExistsError(f"Key already exists at {self.private_key_path}")
+
+        return self._save_keys(ed25519.Ed25519PrivateKey.from_private_bytes(seed))
+
+    def _save_keys(self, private_key: ed25519.Ed25519PrivateKey) -> Tuple[str, str]:
+        """Adopt a private key and write the key pair to disk"""
         self.key_dir.mkdir(parents=True, exist_ok=True)
         
-        # Generate private key
-        self.private_key = ed25519.Ed25519PrivateKey.generate()
+        self.private_key = private_key
         self.public_key = self.private_key.public_key()
         
         # Save private key
-        private_bytes = self.private_key.private_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PrivateFormat.OpenSSH,
-            encryption_algorithm=serialization.NoEncryption()
-        )
+        if self.key_format == "raw":
+            private_bytes = self.private_key.private_bytes_raw()
+        else:
+            private_bytes = self.private_key.private_bytes(
+                encoding=serialization.Encoding.PEM,
+                format=serialization.PrivateFormat.OpenSSH,
+                encryption_algorithm=serialization.NoEncryption()
+            )
         
-        with open(self.private_key_path, "wb") as f:
+        # Create with permissions 600 (read/write only by owner) so the mode is
+        # set atomically at creation and no follow-up chmod is needed
+        self.private_key_path.unlink(missing_ok=True)
+        fd = os.open(self.private_key_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+        with os.fdopen(fd, "wb") as f:
             f.write(private_bytes)
-        
-        # Set permissions to 600 (read/write only by owner)
-        os.chmod(self.private_key_path, 0o600)
             
         # Save public key
-        public_bytes = self.public_key.public_bytes(
-            encoding=serialization.Encoding.OpenSSH,
-            format=serialization.PublicFormat.OpenSSH
-        )
+        if self.key_format == "raw":
+            public_bytes = self.public_key.public_bytes_raw()
+        else:
+            public_bytes = self.public_key.public_bytes(
+                encoding=serialization.Encoding.OpenSSH,
+                format=serialization.PublicFormat.OpenSSH
+            )
         
         with open(self.public_key_path, "wb") as f:
             f.write(public_bytes)
@@ -112,11 +157,14 @@ class SigilIdentity:
             
         with open(self.private_key_path, "rb") as f:
             private_bytes = f.read()
-            
-        self.private_key = serialization.load_ssh_private_key(
-            private_bytes,
-            password=None
-        )
+
+        if self.key_format == "raw":
+            self.private_key = ed25519.Ed25519PrivateKey.from_private_bytes(private_bytes)
+        else:
+            self.private_key = serialization.load_ssh_private_key(
+                private_bytes,
+                password=None
+            )
         
         # Derive public key
         if isinstance(self.private_key, ed25519.Ed25519PrivateKey):
@@ -170,7 +218,7 @@ class SigilIdentity:
         }
         
         # Canonical JSON for signing (sorted keys, no whitespace)
-        payload_bytes = json.dumps(claim, sort_keys=True, separators=(',', ':')).encode('utf-8')
+        payload_bytes = _canonical_bytes(claim)
         
         # Sign payload
         signature_bytes = self.private_key.sign(payload_bytes)
@@ -197,6 +245,10 @@ class SigilIdentity:
             (is_valid, error_message)
         """
         try:
+            algorithm = signature_doc.get("algorithm", "Ed25519")
+            if algorithm != "Ed25519":
+                return False, f"Unsupported algorithm: {algorithm}"
+
             claim = signature_doc.get("claim")
             signature_b64 = str(signature_doc.get("signature"))
             public_key_str = str(signature_doc.get("public_key"))
@@ -223,7 +275,7 @@ class SigilIdentity:
                 return False, "Not an Ed25519 key"
                 
             # Reconstruct payload
-            payload_bytes = json.dumps(claim, sort_keys=True, separators=(',', ':')).encode('utf-8')
+            payload_bytes = _canonical_bytes(claim)
             signature_bytes = base64.b64decode(signature_b64)
             
             # Verify
@@ -264,24 +316,22 @@ class SignatureManager:
         """
         self.identity = identity or SigilIdentity()
 
-    def create_signature_file(
+    def create_signature_bytes(
         self,
         hash_hex: str,
-        output_path: Path,
         video_filename: Optional[str] = None,
         additional_metadata: Optional[Dict[str, Any]] = None
-    ) -> Path:
+    ) -> bytes:
         """
-        Create and save a signature.json file.
+        Create a serialized signature document without touching disk.
 
         Args:
             hash_hex: Perceptual hash (64-char hex)
-            output_path: Where to save signature.json
             video_filename: Original video filename
             additional_metadata: Extra metadata to include
 
         Returns:
-            Path to created signature file
+            UTF-8 encoded signature JSON (same content as signature.json)
         """
         # Ensure identity exists
         if not self.identity.private_key:
@@ -299,28 +349,53 @@ class SignatureManager:
         # Generate signature
         signature_doc = self.identity.sign_hash(hash_hex, metadata)
 
-        # Write to file (pretty-printed for human readability)
+        # Pretty-printed for human readability
+        return json.dumps(signature_doc, indent=2).encode('utf-8')
+
+    def create_signature_file(
+        self,
+        hash_hex: str,
+        output_path: Path,
+        video_filename: Optional[str] = None,
+        additional_metadata: Optional[Dict[str, Any]] = None
+    ) -> Path:
+        """
+        Create and save a signature.json file.
+
+        Args:
+            hash_hex: Perceptual hash (64-char hex)
+            output_path: Where to save signature.json
+            video_filename: Original video filename
+            additional_metadata: Extra metadata to include
+
+        Returns:
+            Path to created signature file
+        """
+        signature_bytes = self.create_signature_bytes(
+            hash_hex,
+            video_filename=video_filename,
+            additional_metadata=additional_metadata
+        )
+
         output_path = Path(output_path)
-        with output_path.open('w') as f:
-            json.dump(signature_doc, f, indent=2)
+        output_path.write_bytes(signature_bytes)
 
         return output_path
 
     @staticmethod
-    def verify_signature_file(signature_path: Path) -> Tuple[bool, Dict[str, Any]]:
+    def verify_signature_bytes(data: bytes) -> Tuple[bool, Dict[str, Any]]:
         """
-        Verify a signature.json file.
+        Verify a serialized signature document.
 
         Args:
-            signature_path: Path to signature.json
+            data: Raw signature JSON (as produced by create_signature_bytes)
 
         Returns:
             Tuple of (is_valid, info_dict)
             - info_dict contains: key_id, hash_hex, signed_at, error (if any)
         """
         try:
-            with signature_path.open('r') as f:
-                signature_doc = json.load(f)
+            signature_doc = json.loads(data)
 
             is_valid, error = SigilIdentity.verify_signature(signature_doc)
 
@@ -335,9 +410,28 @@ class SignatureManager:
 
             return is_valid, info
 
+        except Exception as e:
+            return False, {"error": f"Failed to parse signature: {str(e)}"}
+
+    @staticmethod
+    def verify_signature_file(signature_path: Path) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Verify a signature.json file.
+
+        Args:
+            signature_path: Path to signature.json
+
+        Returns:
+            Tuple of (is_valid, info_dict)
+            - info_dict contains: key_id, hash_hex, signed_at, error (if any)
+        """
+        try:
+            data = Path(signature_path).read_bytes()
         except Exception as e:
             return False, {"error": f"Failed to load signature file: {str(e)}"}
 
+        return SignatureManager.verify_signature_bytes(data)
+
 
 # Convenience functions for CLI usage
 
@@ -9,16 +9,42 @@ import sqlite3
 import json
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Optional, List, Dict
+from typing import Any, Iterable, Optional, List, Dict
 from types import TracebackType
 import numpy as np
 
+from .hash_kernels import hamming_batch, pack_hash
+
+
+# Insert a hash, or fill in metadata (without overwriting it with NULLs) if
+# the packed hash is already stored
+_UPSERT_SQL = '''
+INSERT INTO hashes (
+    hash, hash_hex, hash_bytes, video_id, platform, upload_date,
+    file_path, frame_count, metadata, created_at,
+    signature, public_key, key_id, signed_at, signature_version
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(hash_bytes) DO UPDATE SET
+    video_id = COALESCE(excluded.video_id, video_id),
+    platform = COALESCE(excluded.platform, platform),
+    upload_date = COALESCE(excluded.upload_date, upload_date),
+    file_path = COALESCE(excluded.file_path, file_path),
+    frame_count = COALESCE(excluded.frame_count, frame_count),
+    metadata = COALESCE(excluded.metadata, metadata),
+    signature = COALESCE(excluded.signature, signature),
+    public_key = COALESCE(excluded.public_key, public_key),
+    key_id = COALESCE(excluded.key_id, key_id),
+    signed_at = COALESCE(excluded.signed_at, signed_at),
+    signature_version = COALESCE(excluded.signature_version, signature_version)
+'''
+
 
 class HashDatabase:
     """SQLite database for storing and querying perceptual hashes"""
 
     db_path: Path
     conn: Optional[sqlite3.Connection]
+    _platform_ids: Dict[str, int]
 
     def __init__(self, db_path: str = "hashes.db"):
         """
@@ -29,11 +55,18 @@ class HashDatabase:
         """
         self.db_path = Path(db_path)
         self.conn = None
+        self._platform_ids = {}
         self._init_database()
 
     def _init_database(self):
         """Initialize database schema"""
         self.conn = sqlite3.connect(str(self.db_path))
+        _ = self.conn.executescript('''
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA mmap_size=268435456;
+        ''')
         cursor = self.conn.cursor()
 
         # Create hashes table
@@ -42,6 +75,7 @@ class HashDatabase:
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 hash TEXT NOT NULL,
                 hash_hex TEXT NOT NULL,
+                hash_bytes BLOB,
                 video_id TEXT,
                 platform TEXT,
                 upload_date TEXT,
@@ -53,33 +87,122 @@ class HashDatabase:
                 public_key TEXT,
                 key_id TEXT,
                 signed_at TEXT,
-                signature_version TEXT,
-                UNIQUE(hash)
+                signature_version TEXT
             )
         ''')
 
-        # Create index on hash for fast lookups
-        _ = cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_hash ON hashes(hash)
-        ''')
-
         # Create index on platform for filtering
         _ = cursor.execute('''
             CREATE INDEX IF NOT EXISTS idx_platform ON hashes(platform)
         ''')
 
-        # Create index on key_id for signature queries
+        self.conn.commit()
+
+        # Migrate existing databases to add signature columns
+        self._migrate_schema()
+
+        # Create index on key_id for signature queries (after migration,
+        # since legacy databases only gain key_id there)
         _ = cursor.execute('''
             CREATE INDEX IF NOT EXISTS idx_key_id ON hashes(key_id)
         ''')
 
+        # Hashes are unique by their packed 32-byte form (after migration,
+        # since legacy databases only gain hash_bytes there)
+        _ = cursor.execute('''
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_hash_bytes ON hashes(hash_bytes)
+        ''')
+
         self.conn.commit()
 
-        # Migrate existing databases to add signature columns
-        self._migrate_schema()
+        # Narrow scan table for similarity search
+        self._init_scan_table()
+
+    def _init_scan_table(self):
+        """
+        Create the narrow similarity-scan table and keep it in sync via triggers.
+
+        hashes_scan holds only (id, 32-byte hash, platform id), so a full scan
+        in query_similar reads ~44 bytes per row instead of the wide hashes row.
+        Platform names are interned in the platforms table.
+        """
+        if not self.conn:
+            return
+
+        cursor = self.conn.cursor()
+
+        # Once created, the triggers keep hashes_scan in sync, so only a database
+        # gaining the scan table or its triggers needs existing rows copied over
+        _ = cursor.execute('''
+            SELECT COUNT(*) FROM sqlite_master WHERE name IN (
+                'hashes_scan', 'hashes_scan_insert', 'hashes_scan_update', 'hashes_scan_delete'
+            )
+        ''')
+        needs_backfill = cursor.fetchone()[0] < 4
+
+        _ = cursor.executescript('''
+            CREATE TABLE IF NOT EXISTS platforms (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL UNIQUE
+            );
+
+            CREATE TABLE IF NOT EXISTS hashes_scan (
+                id INTEGER PRIMARY KEY,
+                hash_bytes BLOB NOT NULL,
+                platform_id INTEGER REFERENCES platforms(id)
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_platform_scan ON hashes_scan(platform_id);
+
+            -- Trigger bodies avoid OR IGNORE / OR REPLACE: under the upsert in
+            -- store_hashes SQLite applies the outer statement's conflict policy
+            CREATE TRIGGER IF NOT EXISTS hashes_scan_insert AFTER INSERT ON hashes
+            BEGIN
+                INSERT INTO platforms (name)
+                    SELECT NEW.platform WHERE NEW.platform IS NOT NULL
+                    AND NOT EXISTS (SELECT 1 FROM platforms WHERE name = NEW.platform);
+                DELETE FROM hashes_scan WHERE id = NEW.id;
+                INSERT INTO hashes_scan (id, hash_bytes, platform_id)
+                    VALUES (NEW.id, NEW.hash_bytes,
+                            (SELECT id FROM platforms WHERE name = NEW.platform));
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS hashes_scan_update AFTER UPDATE OF hash_bytes, platform ON hashes
+            BEGIN
+                INSERT INTO platforms (name)
+                    SELECT NEW.platform WHERE NEW.platform IS NOT NULL
+                    AND NOT EXISTS (SELECT 1 FROM platforms WHERE name = NEW.platform);
+                UPDATE hashes_scan SET
+                    hash_bytes = NEW.hash_bytes,
+                    platform_id = (SELECT id FROM platforms WHERE name = NEW.platform)
+                WHERE id = NEW.id;
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS hashes_scan_delete AFTER DELETE ON hashes
+            BEGIN
+                DELETE FROM hashes_scan WHERE id = OLD.id;
+            END;
+        ''')
+
+        if not needs_backfill:
+            return
+
+        # Backfill rows stored before the scan table existed
+        _ = cursor.execute('''
+            INSERT OR IGNORE INTO platforms (name)
+            SELECT DISTINCT platform FROM hashes WHERE platform IS NOT NULL
+        ''')
+        _ = cursor.execute('''
+            INSERT INTO hashes_scan (id, hash_bytes, platform_id)
+            SELECT h.id, h.hash_bytes, p.id
+            FROM hashes h LEFT JOIN platforms p ON p.name = h.platform
+            WHERE h.id NOT IN (SELECT id FROM hashes_scan)
+        ''')
+
+        self.conn.commit()
 
     def _migrate_schema(self):
-        """Migrate existing databases to add signature columns"""
+        """Migrate existing databases to add signature and packed hash columns"""
         if not self.conn:
              return
              
@@ -95,13 +218,24 @@ class HashDatabase:
             'public_key': 'TEXT',
             'key_id': 'TEXT',
             'signed_at': 'TEXT',
-            'signature_version': 'TEXT'
+            'signature_version': 'TEXT',
+            'hash_bytes': 'BLOB'
         }
 
         for col_name, col_type in new_columns.items():
             if col_name not in columns:
                 _ = cursor.execute(f'ALTER TABLE hashes ADD COLUMN {col_name} {col_type}')
 
+        # Backfill packed 32-byte hashes for rows written before hash_bytes existed
+        _ = cursor.execute('SELECT id, hash_hex FROM hashes WHERE hash_bytes IS NULL')
+        backfill = [(bytes.fromhex(hash_hex), row_id) for row_id, hash_hex in cursor.fetchall()]
+        if backfill:
+            _ = cursor.executemany('UPDATE hashes SET hash_bytes = ? WHERE id = ?', backfill)
+
+        # Lookups by hash go through idx_hash_bytes; the old TEXT index only adds
+        # write cost (legacy tables still carry UNIQUE(hash) from their schema)
+        _ = cursor.execute('DROP INDEX IF EXISTS idx_hash')
+
         self.conn.commit()
 
     def store_hash(
@@ -123,7 +257,8 @@ class HashDatabase:
         Store perceptual hash in database
 
         Args:
-            hash_binary: 256-bit numpy array (0s and 1s)
+            hash_binary: 256-bit numpy array (0s and 1s, ideally uint8),
+                or the packed 32-byte uint8 form
             video_id: Optional video identifier (e.g., YouTube video ID)
             platform: Optional platform name (youtube, tiktok, facebook, etc.)
             upload_date: Optional upload date (ISO8601 format)
@@ -141,78 +276,101 @@ class HashDatabase:
         """
         if not self.conn:
             return None
-            
-        cursor = self.conn.cursor()
 
-        # Convert hash to string and hex
-        hash_str = ''.join(map(str, hash_binary.astype(int)))
-        hash_hex = hex(int(hash_str, 2))[2:].zfill(64)
-
-        # Serialize metadata
-        metadata_json = json.dumps(metadata) if metadata else None
-
-        # Insert or update
-        try:
-            _ = cursor.execute('''
-                INSERT INTO hashes (
-                    hash, hash_hex, video_id, platform, upload_date,
-                    file_path, frame_count, metadata, created_at,
-                    signature, public_key, key_id, signed_at, signature_version
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                hash_str,
-                hash_hex,
-                video_id,
-                platform,
-                upload_date,
-                file_path,
-                frame_count,
-                metadata_json,
-                datetime.now(timezone.utc).isoformat(),
-                signature,
-                public_key,
-                key_id,
-                signed_at,
-                signature_version
-            ))
-            self.conn.commit()
-            return cursor.lastrowid
-        except sqlite3.IntegrityError:
-            # Hash already exists - update metadata
-            _ = cursor.execute('''
-                UPDATE hashes SET
-                    video_id = COALESCE(?, video_id),
-                    platform = COALESCE(?, platform),
-                    upload_date = COALESCE(?, upload_date),
-                    file_path = COALESCE(?, file_path),
-                    frame_count = COALESCE(?, frame_count),
-                    metadata = COALESCE(?, metadata),
-                    signature = COALESCE(?, signature),
-                    public_key = COALESCE(?, public_key),
-                    key_id = COALESCE(?, key_id),
-                    signed_at = COALESCE(?, signed_at),
-                    signature_version = COALESCE(?, signature_version)
-                WHERE hash = ?
-            ''', (
-                video_id,
-                platform,
-                upload_date,
-                file_path,
-                frame_count,
-                metadata_json,
-                signature,
-                public_key,
-                key_id,
-                signed_at,
-                signature_version,
-                hash_str
+        return self.store_hashes([{
+            'hash_binary': hash_binary,
+            'video_id': video_id,
+            'platform': platform,
+            'upload_date': upload_date,
+            'file_path': file_path,
+            'frame_count': frame_count,
+            'metadata': metadata,
+            'signature': signature,
+            'public_key': public_key,
+            'key_id': key_id,
+            'signed_at': signed_at,
+            'signature_version': signature_version
+        }])[0]
+
+    def store_hashes(self, records: Iterable[Dict[str, Any]]) -> List[Optional[int]]:
+        """
+        Store many perceptual hashes in a single transaction
+
+        Args:
+            records: Dictionaries with a 'hash_binary' entry and any of the
+                optional store_hash keyword arguments
+
+        Returns:
+            Database row IDs, in the same order as records
+        """
+        records = list(records)
+        if not self.conn or not records:
+            return [None] * len(records)
+
+        created_at = datetime.now(timezone.utc).isoformat()
+
+        rows = []
+        for record in records:
+            # Pack each hash once (packed uint8 input passes through); derive hex
+            # and binary strings from the packed bytes
+            hash_bytes = pack_hash(record['hash_binary']).tobytes()
+            metadata = record.get('metadata')
+            rows.append((
+                format(int.from_bytes(hash_bytes, 'big'), f'0{len(hash_bytes) * 8}b'),
+                hash_bytes.hex(),
+                hash_bytes,
+                record.get('video_id'),
+                record.get('platform'),
+                record.get('upload_date'),
+                record.get('file_path'),
+                record.get('frame_count'),
+                json.dumps(metadata) if metadata else None,
+                created_at,
+                record.get('signature'),
+                record.get('public_key'),
+                record.get('key_id'),
+                record.get('signed_at'),
+                record.get('signature_version')
             ))
-            self.conn.commit()
 
-            # Return existing row ID
-            _ = cursor.execute('SELECT id FROM hashes WHERE hash = ?', (hash_str,))
-            result = cursor.fetchone()
-            return result[0] if result else None
+        # Insert, or update metadata if the hash already exists
+        with self.conn:
+            _ = self.conn.executemany(_UPSERT_SQL, rows)
+
+        # lastrowid is not set on the conflict path, so look the rows up
+        cursor = self.conn.cursor()
+        hash_keys = [row[2] for row in rows]
+        ids_by_hash = {}
+        for start in range(0, len(hash_keys), 500):
+            chunk = hash_keys[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            _ = cursor.execute(
+                f'SELECT id, hash_bytes FROM hashes WHERE hash_bytes IN ({placeholders})',
+                chunk
+            )
+            ids_by_hash.update((hash_bytes, row_id) for row_id, hash_bytes in cursor.fetchall())
+
+        return [ids_by_hash.get(hash_bytes) for hash_bytes in hash_keys]
+
+    def _platform_id(self, platform: str) -> Optional[int]:
+        """
+        Look up the interned id of a platform name
+
+        Ids never change once assigned, so hits are cached on the instance.
+        Misses are not cached, since the platform may be stored later.
+
+        Args:
+            platform: Platform name
+
+        Returns:
+            Platform id, or None if no hash has been stored for the platform
+        """
+        platform_id = self._platform_ids.get(platform)
+        if platform_id is None and self.conn:
+            row = self.conn.execute('SELECT id FROM platforms WHERE name = ?', (platform,)).fetchone()
+            if row is not None:
+                platform_id = self._platform_ids[platform] = row[0]
+        return platform_id
 
     def query_similar(
         self,
@@ -238,55 +396,72 @@ class HashDatabase:
              
         cursor = self.conn.cursor()
 
-        # Query all hashes (with platform filter if specified)
+        # Scan only the narrow table (with platform filter if specified)
         if platform:
+            platform_id = self._platform_id(platform)
+            if platform_id is None:
+                return []
             _ = cursor.execute(
-                '''SELECT id, hash, hash_hex, video_id, platform, upload_date, file_path, frame_count,
-                   metadata, created_at, signature, public_key, key_id, signed_at, signature_version
-                   FROM hashes WHERE platform = ?''',
-                (platform,)
+                'SELECT id, hash_bytes FROM hashes_scan WHERE platform_id = ? ORDER BY id',
+                (platform_id,)
             )
         else:
+            _ = cursor.execute('SELECT id, hash_bytes FROM hashes_scan ORDER BY id')
+
+        candidates = cursor.fetchall()
+        if not candidates:
+            return []
+
+        # Hamming distance for every stored hash at once over packed bytes
+        query_bytes = pack_hash(hash_binary)
+        stored_bytes = np.frombuffer(b''.join(row[1] for row in candidates), dtype=np.uint8)
+        stored_bytes = stored_bytes.reshape(len(candidates), query_bytes.size)
+        distances = hamming_batch(query_bytes, stored_bytes)
+
+        # Keep matches within threshold, sorted by distance (stable for ties)
+        matches = np.flatnonzero(distances <= threshold)
+        matches = matches[np.argsort(distances[matches], kind='stable')][:limit]
+
+        # Fetch the wide rows only for the matches
+        match_ids = [candidates[idx][0] for idx in matches]
+        rows_by_id = {}
+        for start in range(0, len(match_ids), 500):
+            chunk = match_ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
             _ = cursor.execute(
-                '''SELECT id, hash, hash_hex, video_id, platform, upload_date, file_path, frame_count,
+                f'''SELECT id, hash, hash_hex, video_id, platform, upload_date, file_path, frame_count,
                    metadata, created_at, signature, public_key, key_id, signed_at, signature_version
-                   FROM hashes'''
+                   FROM hashes WHERE id IN ({placeholders})''',
+                chunk
             )
+            rows_by_id.update((row[0], row) for row in cursor.fetchall())
 
         results = []
-        query_hash_str = ''.join(map(str, hash_binary.astype(int)))
-
-        for row in cursor.fetchall():
-            stored_hash_str = row[1]
-
-            # Calculate Hamming distance
-            distance = sum(c1 != c2 for c1, c2 in zip(query_hash_str, stored_hash_str))
-
-            if distance <= threshold:
-                results.append({
-                    'id': row[0],
-                    'hash': row[1],
-                    'hash_hex': row[2],
-                    'video_id': row[3],
-                    'platform': row[4],
-                    'upload_date': row[5],
-                    'file_path': row[6],
-                    'frame_count': row[7],
-                    'metadata': json.loads(row[8]) if row[8] else None,
-                    'created_at': row[9],
-                    'signature': row[10],
-                    'public_key': row[11],
-                    'key_id': row[12],
-                    'signed_at': row[13],
-                    'signature_version': row[14],
-                    'hamming_distance': distance,
-                    'similarity': 100 * (1 - distance / 256)
-                })
-
-        # Sort by Hamming distance
-        results.sort(key=lambda x: x['hamming_distance'])
-
-        return results[:limit]
+        for idx, row_id in zip(matches, match_ids):
+            row = rows_by_id[row_id]
+            distance = int(distances[idx])
+
+            results.append({
+                'id': row[0],
+                'hash': row[1],
+                'hash_hex': row[2],
+                'video_id': row[3],
+                'platform': row[4],
+                'upload_date': row[5],
+                'file_path': row[6],
+                'frame_count': row[7],
+                'metadata': json.loads(row[8]) if row[8] else None,
+                'created_at': row[9],
+                'signature': row[10],
+                'public_key': row[11],
+                'key_id': row[12],
+                'signed_at': row[13],
+                'signature_version': row[14],
+                'hamming_distance': distance,
+                'similarity': 100 * (1 - distance / 256)
+            })
+
+        return results
 
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -0,0 +1,58 @@
+"""
+Hash Kernels - Vectorized Hamming distance over packed perceptual hashes
+
+Hashes are compared in packed form (32 bytes for a 256-bit hash). Stored
+hashes are viewed as 64-bit words, XOR-ed against the query and popcounted
+with NumPy's hardware popcount (np.bitwise_count, NumPy >= 2.0). Older NumPy
+versions fall back to a per-byte lookup table.
+"""
+
+import numpy as np
+
+# Number of set bits in each byte value (fallback popcount)
+_POPCOUNT_LUT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+_HAS_BITWISE_COUNT = hasattr(np, "bitwise_count")
+
+
+def pack_hash(hash_binary: np.ndarray, n_bits: int = 256) -> np.ndarray:
+    """
+    Pack a binary hash (array of 0s and 1s) into bytes.
+
+    A uint8 array that is already packed (n_bits // 8 bytes) is returned
+    as-is, so callers holding packed hashes skip the unpack/repack.
+
+    Args:
+        hash_binary: Bit array (e.g. 256 elements), or packed uint8 bytes
+        n_bits: Hash length in bits
+
+    Returns:
+        uint8 array of packed bytes (32 for a 256-bit hash)
+    """
+    hash_array = np.asarray(hash_binary)
+    if hash_array.dtype == np.uint8 and hash_array.size * 8 == n_bits:
+        return hash_array.ravel()
+    return np.packbits(hash_array.astype(np.uint8, copy=False))
+
+
+def hamming_batch(query_bytes: np.ndarray, db_bytes: np.ndarray) -> np.ndarray:
+    """
+    Hamming distance between one packed hash and many packed hashes.
+
+    Args:
+        query_bytes: Packed query hash, shape (n_bytes,)
+        db_bytes: Packed stored hashes, shape (N, n_bytes), dtype uint8
+
+    Returns:
+        int64 array of shape (N,) with the number of differing bits per row
+    """
+    query_bytes = np.ascontiguousarray(query_bytes, dtype=np.uint8)
+    db_bytes = np.ascontiguousarray(db_bytes, dtype=np.uint8)
+
+    if _HAS_BITWISE_COUNT and query_bytes.size % 8 == 0:
+        # One popcount per 64-bit word instead of eight byte lookups
+        xor = np.bitwise_xor(db_bytes.view(np.uint64), query_bytes.view(np.uint64))
+        return np.bitwise_count(xor).sum(axis=1, dtype=np.int64)
+
+    xor = np.bitwise_xor(db_bytes, query_bytes)
+    return _POPCOUNT_LUT[xor].sum(axis=1, dtype=np.int64)
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Dict, List, Union
 import numpy as np
@@ -132,6 +133,19 @@ def extract_perceptual_features(video_frames: List[np.ndarray]) -> Dict[int, Dic
     return features
 
 
+@lru_cache(maxsize=4)
+def _projection_matrix(seed: int, total_dim: int, hash_size: int) -> np.ndarray:
+    """
+    Random projection matrix for a given seed and shape (cached, read-only).
+
+    Uses a private RandomState so the draw matches np.random.seed(seed) +
+    np.random.randn(...) exactly, without reseeding the global generator.
+    """
+    projection = np.random.RandomState(seed).randn(total_dim, hash_size)
+    projection.setflags(write=False)
+    return projection
+
+
 def compute_perceptual_hash(features: Dict[int, Dict[str, np.ndarray]], hash_size: int = 256, seed: Union[int, str, None] = 42) -> np.ndarray:
     """
     Computes a 256-bit perceptual hash from extracted features.
@@ -161,9 +175,7 @@ def compute_perceptual_hash(features: Dict[int, Dict[str, np.ndarray]], hash_siz
             import hashlib
             hex_digest = hashlib.sha256(str(seed).encode('utf-8')).hexdigest()
             real_seed = int(hex_digest, 16) % (2**32)  # numpy seed expects 32-bit int
-        
-    np.random.seed(real_seed)
-    
+
     # Get total feature dimension
     first_features = next(iter(features.values()))
     
@@ -176,7 +188,7 @@ def compute_perceptual_hash(features: Dict[int, Dict[str, np.ndarray]], hash_siz
     
     # Generate random projection matrix (LSH concept)
     # Project high-dim features to hash_size bits
-    projection = np.random.randn(total_dim, hash_size)
+    projection = _projection_matrix(real_seed, total_dim, hash_size)
     
     # Incremental update of projected mean
     projected_mean = np.zeros(hash_size)
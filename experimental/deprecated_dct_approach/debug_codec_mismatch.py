@@ -41,7 +41,7 @@ def compress_with_differentiable_codec(frame: np.ndarray) -> np.ndarray:
     codec = DifferentiableH264(quality_factor=28, temperature=0.1)
     codec.eval()  # Use hard quantization
 
-    with torch.no_grad():
+    with torch.inference_mode():
         compressed_tensor = codec(frame_tensor)
 
     # Convert back
@@ -8,7 +8,20 @@ CORRECT implementation: Extracts AC coefficient patterns, not absolute values.
 import cv2
 import numpy as np
 import json
-from typing import Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+
+def _dct_basis(n: int = 8) -> np.ndarray:
+    """Orthonormal DCT-II basis, so basis @ block @ basis.T matches cv2.dct(block)."""
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    basis = np.sqrt(2.0 / n) * np.cos(np.pi * (2 * i + 1) * k / (2 * n))
+    basis[0] /= np.sqrt(2.0)
+    return basis.astype(np.float32)
+
+
+_DCT8 = _dct_basis(8)
 
 
 class FrequencySignatureDetector:
@@ -24,11 +37,57 @@ class FrequencySignatureDetector:
         with open(signature_path, 'r') as f:
             data = json.load(f)
 
-        self.signature_dct = np.array(data['signature_dct'], dtype=np.float32)
-        self.temporal_signature = np.array(data['temporal_signature'], dtype=np.float32)
-        self.epsilon = data['epsilon']
-        self.frequency_band = data['frequency_band']
-        self.temporal_period = data['temporal_period']
+        self._set_signature(
+            np.array(data['signature_dct'], dtype=np.float32),
+            np.array(data['temporal_signature'], dtype=np.float32),
+            data['epsilon'],
+            data['frequency_band'],
+            data['temporal_period']
+        )
+
+    @classmethod
+    def from_array(
+        cls,
+        signature_dct: np.ndarray,
+        epsilon: float,
+        frequency_band: str,
+        temporal_signature: Optional[np.ndarray] = None,
+        temporal_period: int = 30
+    ) -> 'FrequencySignatureDetector':
+        """
+        Build a detector from an in-memory signature (no JSON round-trip).
+
+        If temporal_signature is omitted, the marker's default sine pattern
+        over temporal_period frames is used.
+        """
+        if temporal_signature is None:
+            t = np.arange(temporal_period)
+            temporal_signature = np.sin(2 * np.pi * t / temporal_period)
+
+        detector = cls.__new__(cls)
+        detector._set_signature(
+            np.asarray(signature_dct, dtype=np.float32),
+            np.asarray(temporal_signature, dtype=np.float32),
+            epsilon,
+            frequency_band,
+            temporal_period
+        )
+        return detector
+
+    def _set_signature(
+        self,
+        signature_dct: np.ndarray,
+        temporal_signature: np.ndarray,
+        epsilon: float,
+        frequency_band: str,
+        temporal_period: int
+    ):
+        """Store signature parameters and precompute the normalized AC pattern."""
+        self.signature_dct = signature_dct
+        self.temporal_signature = temporal_signature
+        self.epsilon = epsilon
+        self.frequency_band = frequency_band
+        self.temporal_period = temporal_period
 
         # Extract AC coefficients from signature (ignore DC at [0,0])
         self.signature_ac = self.signature_dct.copy()
@@ -39,11 +98,14 @@ class FrequencySignatureDetector:
         self,
         video_path: str,
         num_frames: int = 30,
-        num_blocks_per_frame: int = 100
+        num_blocks_per_frame: int = 100,
+        rng: Optional[np.random.Generator] = None
     ) -> Tuple[float, dict]:
         """
         Detect signature in a video.
 
+        Blocks are sampled with rng if given, otherwise with NumPy's global RNG.
+
         Returns:
             (detection_score, debug_info)
 
@@ -59,7 +121,7 @@ class FrequencySignatureDetector:
         # Sample frames
         frame_indices = np.linspace(0, total_frames - 1, num_frames, dtype=int)
 
-        all_ac_patterns = []  # Normalized AC patterns from all blocks
+        all_ac_patterns = []  # Normalized AC patterns, one (num_samples, 64) array per frame
 
         for frame_idx in frame_indices:
             cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
@@ -83,51 +145,71 @@ class FrequencySignatureDetector:
             total_blocks = num_blocks_h * num_blocks_w
 
             num_samples = min(num_blocks_per_frame, total_blocks)
-            block_indices = np.random.choice(total_blocks, num_samples, replace=False)
-
-            for block_idx in block_indices:
-                block_i = (block_idx // num_blocks_w) * 8
-                block_j = (block_idx % num_blocks_w) * 8
+            block_indices = (rng or np.random).choice(total_blocks, num_samples, replace=False)
 
-                block = y_padded[block_i:block_i+8, block_j:block_j+8]
+            # Gather the sampled blocks (row-major block order) and DCT them in one batch
+            blocks = y_padded.reshape(num_blocks_h, 8, num_blocks_w, 8).swapaxes(1, 2)
+            blocks = blocks.reshape(total_blocks, 8, 8)[block_indices]
+            dct_blocks = _DCT8 @ blocks @ _DCT8.T
 
-                if block.shape == (8, 8):
-                    dct_block = cv2.dct(block)
+            # Extract AC coefficients (zero out DC)
+            ac_coeffs = dct_blocks.reshape(num_samples, 64)
+            ac_coeffs[:, 0] = 0
 
-                    # Extract AC coefficients (zero out DC)
-                    ac_coeffs = dct_block.copy()
-                    ac_coeffs[0, 0] = 0
+            # Normalize
+            ac_coeffs /= np.linalg.norm(ac_coeffs, axis=1, keepdims=True) + 1e-8
 
-                    # Normalize
-                    ac_norm = ac_coeffs / (np.linalg.norm(ac_coeffs) + 1e-8)
-
-                    all_ac_patterns.append(ac_norm)
+            all_ac_patterns.append(ac_coeffs)
 
         cap.release()
 
         if not all_ac_patterns:
             return 0.0, {'error': 'No blocks extracted'}
 
-        # Compute correlation of each AC pattern with signature
-        correlations = []
-        for ac_pattern in all_ac_patterns:
-            corr = np.dot(ac_pattern.flatten(), self.signature_ac_norm.flatten())
-            correlations.append(corr)
+        # Compute correlation of each AC pattern with signature (one mat-vec)
+        patterns = np.concatenate(all_ac_patterns)
+        correlations = patterns @ self.signature_ac_norm.ravel()
 
         # Detection score: mean absolute correlation
         # (signature could be negated due to temporal modulation)
         detection_score = float(np.mean(np.abs(correlations)))
 
         debug_info = {
-            'num_blocks': len(all_ac_patterns),
+            'num_blocks': len(patterns),
             'mean_correlation': float(np.mean(correlations)),
             'std_correlation': float(np.std(correlations)),
             'max_correlation': float(np.max(np.abs(correlations))),
-            'positive_ratio': float(np.sum(np.array(correlations) > 0) / len(correlations))
+            'positive_ratio': float(np.sum(correlations > 0) / len(correlations))
         }
 
         return detection_score, debug_info
 
+    def detect_in_videos(
+        self,
+        video_paths: List[str],
+        num_frames: int = 30,
+        num_blocks_per_frame: int = 100,
+        max_workers: int = 2,
+        seed: Optional[int] = None
+    ) -> List[Tuple[float, dict]]:
+        """
+        Detect signature in several videos with the same detector.
+
+        Videos are decoded in parallel threads (OpenCV releases the GIL while
+        decoding), sharing this detector's precomputed signature pattern.
+        Each video samples blocks from its own generator spawned from seed,
+        so the result does not depend on thread scheduling.
+
+        Returns:
+            List of (detection_score, debug_info), in input order
+        """
+        rngs = [np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(len(video_paths))]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(
+                lambda path, rng: self.detect_in_video(path, num_frames, num_blocks_per_frame, rng),
+                video_paths, rngs
+            ))
+
 
 if __name__ == '__main__':
     import sys
@@ -20,12 +20,23 @@ Result: Signature embedded in compression-stable frequency bands.
 import cv2
 import numpy as np
 import json
+import queue
+import threading
 import torch
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Iterable, Iterator, Optional, Tuple
 from tqdm import tqdm
 
 
+def read_frames(cap: cv2.VideoCapture, max_frames: int) -> Iterator[np.ndarray]:
+    """Yield up to max_frames frames from an open capture, stopping at the first failed read."""
+    for _ in range(max_frames):
+        ret, frame = cap.read()
+        if not ret:
+            return
+        yield frame
+
+
 class FrequencyDomainVideoMarker:
     """
     Frequency domain video poisoning via DCT coefficient perturbation.
@@ -178,13 +189,66 @@ class FrequencyDomainVideoMarker:
             print(f"  Frequency band: {self.frequency_band}")
             print()
 
-        iterator = tqdm(range(total_frames), desc="Poisoning frames") if verbose else range(total_frames)
+        frames = read_frames(cap, total_frames)
+        if verbose:
+            frames = tqdm(frames, total=total_frames, desc="Poisoning frames", mininterval=0.5)
+
+        # Encode on a writer thread (VideoWriter releases the GIL) so decoding
+        # and poisoning the next frames overlaps with encoding the previous ones
+        pending = queue.Queue(maxsize=8)
+        write_errors = []
+
+        def write_frames():
+            # Keep draining after a failure so the producer never blocks on put()
+            while True:
+                frame = pending.get()
+                if frame is None:
+                    return
+                if write_errors:
+                    continue
+                try:
+                    out.write(frame)
+                except Exception as e:
+                    write_errors.append(e)
+
+        writer = threading.Thread(target=write_frames, daemon=True)
+        writer.start()
+        try:
+            for frame in self.poison_frames(frames, poison_all_frames):
+                if write_errors:
+                    break
+                pending.put(frame)
+        finally:
+            pending.put(None)
+            writer.join()
+            cap.release()
+            out.release()
+
+        if write_errors:
+            raise RuntimeError(f"Failed to write poisoned video: {output_path}") from write_errors[0]
 
-        for frame_idx in iterator:
-            ret, frame = cap.read()
-            if not ret:
-                break
+        if verbose:
+            print(f"\n✓ Poisoned video saved to {output_path}")
+
+    def poison_frames(
+        self,
+        frames: Iterable[np.ndarray],
+        poison_all_frames: bool = True
+    ) -> Iterator[np.ndarray]:
+        """
+        Poison a stream of BGR frames in memory.
+
+        Same per-frame logic as poison_video, for callers that hand the
+        frames straight to an encoder instead of writing a video file.
 
+        Args:
+            frames: Input frames (BGR, uint8), in display order
+            poison_all_frames: If False, only poison keyframes (every temporal_period frames)
+
+        Yields:
+            Poisoned (or unchanged, for skipped frames) BGR frames
+        """
+        for frame_idx, frame in enumerate(frames):
             # Decide if we poison this frame
             is_keyframe = (frame_idx % self.temporal_period == 0)
             should_poison = poison_all_frames or is_keyframe
@@ -195,17 +259,10 @@ class FrequencyDomainVideoMarker:
                 temporal_weight = self.temporal_signature[temporal_idx]
 
                 # Poison frame in DCT domain
-                poisoned_frame = self._poison_frame_dct(frame, temporal_weight)
-                out.write(poisoned_frame)
+                yield self._poison_frame_dct(frame, temporal_weight)
             else:
-                # Write frame unchanged
-                out.write(frame)
-
-        cap.release()
-        out.release()
-
-        if verbose:
-            print(f"\n✓ Poisoned video saved to {output_path}")
+                # Frame unchanged
+                yield frame
 
     def _poison_frame_dct(
         self,
@@ -223,6 +280,9 @@ class FrequencyDomainVideoMarker:
         5. Inverse DCT
         6. Convert YCbCr → BGR
 
+        Steps 2-5 are linear, so they are applied in closed form: the inverse
+        DCT of the perturbation is added to every 8x8 block at once.
+
         Args:
             frame: Input frame (BGR, uint8)
             temporal_weight: Temporal modulation factor [-1, 1]
@@ -242,22 +302,15 @@ class FrequencyDomainVideoMarker:
         pad_w = (8 - width % 8) % 8
         y_padded = np.pad(y_channel, ((0, pad_h), (0, pad_w)), mode='edge')
 
-        # Process each 8x8 block
-        for i in range(0, y_padded.shape[0], 8):
-            for j in range(0, y_padded.shape[1], 8):
-                block = y_padded[i:i+8, j:j+8]
-
-                # DCT transform
-                dct_block = cv2.dct(block)
-
-                # Add signature perturbation
-                # Scale by epsilon, temporal weight, and 255.0 (DCT operates on [0, 255])
-                perturbation = self.epsilon * temporal_weight * self.signature_dct * 255.0
-                dct_block = dct_block + perturbation
+        # Signature perturbation in the DCT domain
+        # Scale by epsilon, temporal weight, and 255.0 (DCT operates on [0, 255])
+        perturbation = (self.epsilon * temporal_weight * self.signature_dct * 255.0).astype(np.float32)
 
-                # Inverse DCT
-                block_poisoned = cv2.idct(dct_block)
-                y_padded[i:i+8, j:j+8] = block_poisoned
+        # The DCT is linear, so idct(dct(block) + perturbation) == block + idct(perturbation)
+        # for every 8x8 block: add one spatial tile replicated across the frame
+        # instead of transforming each block
+        spatial_tile = cv2.idct(perturbation)
+        y_padded += np.tile(spatial_tile, (y_padded.shape[0] // 8, y_padded.shape[1] // 8))
 
         # Remove padding
         y_poisoned = y_padded[:height, :width]
@@ -39,10 +39,10 @@ def generate_training_frames(num_frames: int = 50, resolution: int = 224) -> tor
         # Create varied content
         frame = np.zeros((resolution, resolution, 3), dtype=np.float32)
 
-        # Random gradient background
-        for y in range(resolution):
-            intensity = 50 + 150 * y / resolution + np.random.randn() * 10
-            frame[y, :] = np.clip([intensity, intensity * 0.7, intensity * 0.5], 0, 255)
+        # Random gradient background (one noise draw per row, broadcast across columns)
+        intensity = 50 + 150 * np.arange(resolution) / resolution + np.random.randn(resolution) * 10
+        row_colors = np.clip(intensity[:, None] * np.array([1.0, 0.7, 0.5]), 0, 255)
+        frame[:] = row_colors[:, None, :]
 
         # Random shapes
         num_shapes = np.random.randint(2, 5)
@@ -273,15 +273,16 @@ def train_adaptive_signature(
             signature.data[:, 3:] = 0
             signature.data[0, 0] = 0  # Keep DC zero
 
-        # Track best
-        if detection_score.item() > best_score:
-            best_score = detection_score.item()
+        # Track best (read the score once per iteration)
+        detection_value = detection_score.item()
+        if detection_value > best_score:
+            best_score = detection_value
             best_signature = signature.data.clone()
             best_epsilon = epsilon.item()
 
         # Print progress
         if (iteration + 1) % 20 == 0:
-            print(f"Iter {iteration+1:3d}: Detection={detection_score.item():.4f}, "
+            print(f"Iter {iteration+1:3d}: Detection={detection_value:.4f}, "
                   f"PSNR={psnr.item():.2f} dB, Epsilon={epsilon.item():.4f}, "
                   f"Loss={total_loss.item():.4f}")
 
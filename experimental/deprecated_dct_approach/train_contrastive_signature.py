@@ -288,6 +288,13 @@ def train_contrastive_signature(
     val_clean_paths = generate_diverse_videos('/tmp/contrastive_val_clean', num_val_videos)
     print()
 
+    # Decode every video once up front; iterations and validation rounds
+    # reuse the cached frames instead of seeking and decoding again
+    train_frames = {path: load_video_frames(path, num_frames=10) for path in train_clean_paths}
+    val_frames = [load_video_frames(val_path, num_frames=10) for val_path in val_clean_paths]
+    val_sizes = [len(frames) for frames in val_frames]
+    val_clean = torch.cat(val_frames)
+
     # Initialize signature (random, low-freq only)
     signature = torch.randn(8, 8)
     signature[3:, :] = 0  # Zero high frequencies
@@ -304,6 +311,15 @@ def train_contrastive_signature(
 
     # Differentiable codec (with straight-through estimator)
     codec = DifferentiableH264(quality_factor=target_crf, temperature=0.1)
+
+    # The codec has no parameters and clean frames carry no gradient, so
+    # compressed clean frames never change: compress them once for every
+    # iteration and validation round (train and eval forwards both quantize hard)
+    codec.eval()
+    with torch.no_grad():
+        train_compressed = {path: codec(frames) for path, frames in train_frames.items()}
+        val_clean_compressed = codec(val_clean)
+
     codec.train()  # Enable training mode for straight-through estimator
 
     print("Training...")
@@ -318,13 +334,13 @@ def train_contrastive_signature(
 
         # Sample random training video
         clean_path = np.random.choice(train_clean_paths)
-        clean_frames = load_video_frames(clean_path, num_frames=10)
+        clean_frames = train_frames[clean_path]
 
         # Poison frames
         poisoned_frames = apply_dct_signature(clean_frames, signature, epsilon)
 
-        # Compress both clean and poisoned
-        clean_compressed = codec(clean_frames)
+        # Compress poisoned (clean is compressed once up front)
+        clean_compressed = train_compressed[clean_path]
         poisoned_compressed = codec(poisoned_frames)
 
         # Compute detection scores
@@ -353,8 +369,10 @@ def train_contrastive_signature(
             signature.data[:, 3:] = 0
             signature.data[0, 0] = 0
 
-        # Track best separation
-        separation = poisoned_score.item() - clean_score.item()
+        # Track best separation (read each scalar once per iteration)
+        poisoned_value = poisoned_score.item()
+        clean_value = clean_score.item()
+        separation = poisoned_value - clean_value
         if separation > best_separation:
             best_separation = separation
             best_signature = signature.data.clone()
@@ -363,8 +381,8 @@ def train_contrastive_signature(
         # Print progress
         if (iteration + 1) % 50 == 0:
             print(f"Iter {iteration+1:3d}: "
-                  f"Poisoned={poisoned_score.item():.4f}, "
-                  f"Clean={clean_score.item():.4f}, "
+                  f"Poisoned={poisoned_value:.4f}, "
+                  f"Clean={clean_value:.4f}, "
                   f"Separation={separation:.4f}, "
                   f"PSNR={psnr.item():.2f} dB, "
                   f"Epsilon={epsilon.item():.4f}")
@@ -376,19 +394,21 @@ def train_contrastive_signature(
 
             codec.eval()  # Use hard quantization for validation
 
-            with torch.no_grad():
+            # Validation only reads the signature, so skip autograd bookkeeping entirely
+            with torch.inference_mode():
                 val_clean_scores = []
                 val_poisoned_scores = []
 
-                for val_path in val_clean_paths:
-                    val_frames = load_video_frames(val_path, num_frames=10)
-                    val_poisoned = apply_dct_signature(val_frames, signature, epsilon)
+                # Poison and compress all validation videos as one batch,
+                # then score each video on its own slice
+                val_poisoned = apply_dct_signature(val_clean, signature, epsilon)
 
-                    val_clean_compressed = codec(val_frames)
-                    val_poisoned_compressed = codec(val_poisoned)
+                val_poisoned_compressed = codec(val_poisoned)
 
-                    val_clean_score = compute_detection_score_differentiable(val_clean_compressed, signature)
-                    val_poisoned_score = compute_detection_score_differentiable(val_poisoned_compressed, signature)
+                for clean_video, poisoned_video in zip(val_clean_compressed.split(val_sizes),
+                                                       val_poisoned_compressed.split(val_sizes)):
+                    val_clean_score = compute_detection_score_differentiable(clean_video, signature)
+                    val_poisoned_score = compute_detection_score_differentiable(poisoned_video, signature)
 
                     val_clean_scores.append(val_clean_score.item())
                     val_poisoned_scores.append(val_poisoned_score.item())
@@ -412,14 +432,18 @@ def train_contrastive_signature(
                 print()
                 print("[REAL H.264] Testing on actual ffmpeg compression...")
 
-                # Save current signature
-                temp_sig_path = '/tmp/temp_signature.json'
+                # Current signature, handed to the detector in memory
                 temp_marker = FrequencyDomainVideoMarker(epsilon=epsilon.item(), frequency_band='low')
                 temp_marker.signature_dct = signature.detach().cpu().numpy()
-                temp_marker.save_signature(temp_sig_path)
 
                 from frequency_detector import FrequencySignatureDetector
-                temp_detector = FrequencySignatureDetector(temp_sig_path)
+                temp_detector = FrequencySignatureDetector.from_array(
+                    temp_marker.signature_dct,
+                    temp_marker.epsilon,
+                    temp_marker.frequency_band,
+                    temporal_signature=temp_marker.temporal_signature,
+                    temporal_period=temp_marker.temporal_period
+                )
 
                 # Test on one validation video
                 test_video = val_clean_paths[0]
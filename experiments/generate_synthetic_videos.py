@@ -1,6 +1,7 @@
 import cv2
 import numpy as np
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 def make_solid_color_video(path, color, num_frames=30, size=(128, 128), fps=15):
     fourcc = cv2.VideoWriter_fourcc(*'mp4v')
@@ -24,8 +25,11 @@ def make_moving_square_video(path, num_frames=30, size=(128, 128), fps=15):
 def make_noise_video(path, num_frames=30, size=(128, 128), fps=15):
     fourcc = cv2.VideoWriter_fourcc(*'mp4v')
     out = cv2.VideoWriter(path, fourcc, fps, size)
+    # Local PCG64 generator: faster than the legacy global RNG and safe
+    # to use while other videos are generated on other threads
+    rng = np.random.default_rng()
     for _ in range(num_frames):
-        frame = np.random.randint(0, 256, (size[1], size[0], 3), dtype=np.uint8)
+        frame = rng.integers(0, 256, (size[1], size[0], 3), dtype=np.uint8)
         out.write(frame)
     out.release()
 
@@ -43,12 +47,20 @@ def make_gradient_video(path, num_frames=30, size=(128, 128), fps=15):
 def main():
     out_dir = "test_batch_input"
     os.makedirs(out_dir, exist_ok=True)
-    make_solid_color_video(os.path.join(out_dir, "solid_red.mp4"), (0, 0, 255))
-    make_solid_color_video(os.path.join(out_dir, "solid_green.mp4"), (0, 255, 0))
-    make_solid_color_video(os.path.join(out_dir, "solid_blue.mp4"), (255, 0, 0))
-    make_moving_square_video(os.path.join(out_dir, "moving_square.mp4"))
-    make_noise_video(os.path.join(out_dir, "noise.mp4"))
-    make_gradient_video(os.path.join(out_dir, "gradient.mp4"))
+    jobs = [
+        (make_solid_color_video, "solid_red.mp4", ((0, 0, 255),)),
+        (make_solid_color_video, "solid_green.mp4", ((0, 255, 0),)),
+        (make_solid_color_video, "solid_blue.mp4", ((255, 0, 0),)),
+        (make_moving_square_video, "moving_square.mp4", ()),
+        (make_noise_video, "noise.mp4", ()),
+        (make_gradient_video, "gradient.mp4", ()),
+    ]
+    # Videos are independent and OpenCV encodes without holding the GIL,
+    # so write them from a thread pool
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = [executor.submit(make, os.path.join(out_dir, name), *args) for make, name, args in jobs]
+        for future in futures:
+            future.result()
     print("Synthetic videos generated in test_batch_input/")
 
 if __name__ == "__main__":
@@ -27,10 +27,11 @@ def make_varied_test_videos():
     # 3. Gradient + noise, 180 frames (12 seconds at 15 fps)
     path3 = os.path.join(out_dir, "long_gradient_noise.mp4")
     out3 = cv2.VideoWriter(path3, fourcc, 15, (128, 128))
+    rng = np.random.default_rng()
+    grad = np.tile(np.linspace(0, 255, 128, dtype=np.uint8), (128, 1))
     for i in range(180):
-        grad = np.tile(np.linspace(0, 255, 128, dtype=np.uint8), (128, 1))
         frame = np.stack([grad, np.flipud(grad), np.roll(grad, i % 128, axis=1)], axis=2)
-        noise = np.random.randint(0, 32, (128, 128, 3), dtype=np.uint8)
+        noise = rng.integers(0, 32, (128, 128, 3), dtype=np.uint8)
         frame = cv2.add(frame, noise)
         out3.write(frame)
     out3.release()
@@ -16,9 +16,6 @@ import subprocess
 from pathlib import Path
 import numpy as np
 import cv2
-import sys
-
-sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from core.batch_robustness import compress_and_compare_video, batch_test_videos
 
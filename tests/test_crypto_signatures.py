@@ -9,16 +9,15 @@ Tests cover:
 - Error handling
 """
 
+import os
 import unittest
 import tempfile
 import shutil
+import hashlib
 import json
 from pathlib import Path
 
 # Import modules to test
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from core.crypto_signatures import (
     SigilIdentity,
     SignatureManager,
@@ -29,18 +28,34 @@ from core.crypto_signatures import (
 )
 
 
-class TestSigilIdentity(unittest.TestCase):
+class TempRootTestCase(unittest.TestCase):
+    """Base class giving each test a directory under one per-class temporary root"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Create one temporary root shared by every test in the class"""
+        cls._root = Path(tempfile.mkdtemp())
+        cls.seed = hashlib.sha256(cls.__name__.encode()).digest()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up the shared temporary root in a single pass"""
+        shutil.rmtree(cls._root)
+
+    def setUp(self):
+        """Create per-test directory under the shared root"""
+        self.test_dir = self._root / self._testMethodName
+        self.test_dir.mkdir()
+
+
+class TestSigilIdentity(TempRootTestCase):
     """Test cases for SigilIdentity class"""
 
     def setUp(self):
-        """Create temporary directory for test keys"""
-        self.test_dir = Path(tempfile.mkdtemp())
+        """Create per-test key directory under the shared root"""
+        super().setUp()
         self.key_name = "test_identity"
 
-    def tearDown(self):
-        """Clean up temporary directory"""
-        shutil.rmtree(self.test_dir)
-
     def test_identity_generation(self):
         """Test generating a new Ed25519 identity"""
         identity = SigilIdentity(key_dir=str(self.test_dir), private_key_name=self.key_name)
@@ -51,7 +66,8 @@ class TestSigilIdentity(unittest.TestCase):
         self.assertTrue(Path(pub_path).exists())
 
         # Check permissions
-        self.assertEqual(Path(priv_path).stat().st_mode & 0o777, 0o600)
+        mode = os.stat(priv_path).st_mode & 0o777
+        self.assertEqual(mode, 0o600)
 
         # Check keys are loaded
         self.assertIsNotNone(identity.private_key)
@@ -61,7 +77,7 @@ class TestSigilIdentity(unittest.TestCase):
         """Test loading an existing identity"""
         # Generate identity
         identity1 = SigilIdentity(key_dir=str(self.test_dir), private_key_name=self.key_name)
-        identity1.generate_keys()
+        identity1._generate_from_seed(self.seed)
         key_id1 = identity1.get_key_id()
 
         # Load identity in new instance
@@ -74,7 +90,7 @@ class TestSigilIdentity(unittest.TestCase):
     def test_key_id_format(self):
         """Test key ID fingerprint format"""
         identity = SigilIdentity(key_dir=str(self.test_dir), private_key_name=self.key_name)
-        identity.generate_keys()
+        identity._generate_from_seed(self.seed)
 
         key_id = identity.get_key_id()
 
@@ -84,7 +100,7 @@ class TestSigilIdentity(unittest.TestCase):
     def test_sign_hash_valid(self):
         """Test signing a valid hash"""
         identity = SigilIdentity(key_dir=str(self.test_dir), private_key_name=self.key_name)
-        identity.generate_keys()
+        identity._generate_from_seed(self.seed)
 
         # Test hash (64 hex chars)
         test_hash = "a3f2b1c4d5e6f7a8b9c0d1e2f3a4b5c6d7e8f9a0b1c2d3e4f5a6b7c8d9e0f1a2"
@@ -119,7 +135,7 @@ class TestSigilIdentity(unittest.TestCase):
     def test_verify_signature_valid(self):
         """Test verifying a valid signature"""
         identity = SigilIdentity(key_dir=str(self.test_dir), private_key_name=self.key_name)
-        identity.generate_keys()
+        identity._generate_from_seed(self.seed)
 
         test_hash = "a" * 64
         sig_doc = identity.sign_hash(test_hash)
@@ -133,7 +149,7 @@ class TestSigilIdentity(unittest.TestCase):
     def test_verify_signature_tampered(self):
         """Test verifying a tampered signature"""
         identity = SigilIdentity(key_dir=str(self.test_dir), private_key_name=self.key_name)
-        identity.generate_keys()
+        identity._generate_from_seed(self.seed)
 
         test_hash = "a" * 64
         sig_doc = identity.sign_hash(test_hash)
@@ -150,10 +166,10 @@ class TestSigilIdentity(unittest.TestCase):
     def test_verify_signature_wrong_key(self):
         """Test verifying with wrong public key"""
         identity1 = SigilIdentity(key_dir=str(self.test_dir), private_key_name="id1")
-        identity1.generate_keys()
+        identity1._generate_from_seed(self.seed)
 
         identity2 = SigilIdentity(key_dir=str(self.test_dir), private_key_name="id2")
-        identity2.generate_keys()
+        identity2._generate_from_seed(hashlib.sha256(self.seed).digest())
 
         # Sign with identity1
         test_hash = "a" * 64
@@ -171,7 +187,7 @@ class TestSigilIdentity(unittest.TestCase):
     def test_export_public_key(self):
         """Test exporting public key in PEM format"""
         identity = SigilIdentity(key_dir=str(self.test_dir), private_key_name=self.key_name)
-        identity.generate_keys()
+        identity._generate_from_seed(self.seed)
 
         public_pem = identity.export_public_key()
 
@@ -179,6 +195,32 @@ class TestSigilIdentity(unittest.TestCase):
         self.assertIn("-----BEGIN PUBLIC KEY-----", public_pem)
         self.assertIn("-----END PUBLIC KEY-----", public_pem)
 
+    def test_raw_key_format(self):
+        """Test raw 32-byte key storage round-trips"""
+        identity = SigilIdentity(
+            key_dir=str(self.test_dir), private_key_name=self.key_name, key_format="raw"
+        )
+        priv_path, pub_path = identity._generate_from_seed(self.seed)
+
+        # Raw Ed25519 keys are exactly 32 bytes on disk
+        self.assertEqual(os.stat(priv_path).st_size, 32)
+        self.assertEqual(os.stat(pub_path).st_size, 32)
+        self.assertEqual(os.stat(priv_path).st_mode & 0o777, 0o600)
+
+        # Loading in a new instance yields the same identity
+        reloaded = SigilIdentity(
+            key_dir=str(self.test_dir), private_key_name=self.key_name, key_format="raw"
+        )
+        self.assertEqual(reloaded.get_key_id(), identity.get_key_id())
+
+        # PEM stays available as an export format
+        self.assertIn("-----BEGIN PUBLIC KEY-----", reloaded.export_public_key())
+
+    def test_invalid_key_format(self):
+        """Test unknown key formats are rejected"""
+        with self.assertRaises(ValueError):
+            SigilIdentity(key_dir=str(self.test_dir), key_format="pem")
+
     def test_overwrite_protection(self):
         """Test that force=False prevents key replacement"""
         identity = SigilIdentity(key_dir=str(self.test_dir), private_key_name=self.key_name)
@@ -198,6 +240,7 @@ class TestSigilIdentity(unittest.TestCase):
 
         # In this implementation, paths are returned, so they match
         self.assertEqual(key_id1, key_id2)
+        self.assertEqual(os.stat(key_id2).st_mode & 0o777, 0o600)
         
         # But key content changed, let's verify key_id
         # We need to reload to be sure or just check new key_id
@@ -207,23 +250,19 @@ class TestSigilIdentity(unittest.TestCase):
         # Note: Ed25519 generation is random.
 
 
-class TestSignatureManager(unittest.TestCase):
+class TestSignatureManager(TempRootTestCase):
     """Test cases for SignatureManager class"""
 
     def setUp(self):
-        """Create temporary directory for test files"""
-        self.test_dir = Path(tempfile.mkdtemp())
+        """Create per-test directory under the shared root"""
+        super().setUp()
         self.key_name = "test_identity"
         self.test_sig_path = self.test_dir / "test.signature.json"
 
-    def tearDown(self):
-        """Clean up temporary directory"""
-        shutil.rmtree(self.test_dir)
-
     def test_create_signature_file(self):
         """Test creating a signature file"""
         identity = SigilIdentity(key_dir=str(self.test_dir), private_key_name=self.key_name)
-        identity.generate_keys()
+        identity._generate_from_seed(self.seed)
 
         sig_manager = SignatureManager(identity)
 
@@ -247,7 +286,7 @@ class TestSignatureManager(unittest.TestCase):
     def test_verify_signature_file_valid(self):
         """Test verifying a valid signature file"""
         identity = SigilIdentity(key_dir=str(self.test_dir), private_key_name=self.key_name)
-        identity.generate_keys()
+        identity._generate_from_seed(self.seed)
 
         sig_manager = SignatureManager(identity)
 
@@ -267,7 +306,7 @@ class TestSignatureManager(unittest.TestCase):
     def test_verify_signature_file_tampered(self):
         """Test verifying a tampered signature file"""
         identity = SigilIdentity(key_dir=str(self.test_dir), private_key_name=self.key_name)
-        identity.generate_keys()
+        identity._generate_from_seed(self.seed)
 
         sig_manager = SignatureManager(identity)
 
@@ -292,19 +331,82 @@ class TestSignatureManager(unittest.TestCase):
         self.assertFalse(is_valid)
         self.assertIsNotNone(info["error"])
 
+    def test_verify_signature_bytes_valid(self):
+        """Test verifying an in-memory signature document"""
+        identity = SigilIdentity(key_dir=str(self.test_dir), private_key_name=self.key_name)
+        identity._generate_from_seed(self.seed)
+
+        sig_manager = SignatureManager(identity)
+
+        test_hash = "a" * 64
+        sig_bytes = sig_manager.create_signature_bytes(
+            hash_hex=test_hash,
+            video_filename="test.mp4"
+        )
+
+        is_valid, info = SignatureManager.verify_signature_bytes(sig_bytes)
+
+        self.assertTrue(is_valid)
+        self.assertEqual(info["hash_hex"], test_hash)
+        self.assertIsNone(info["error"])
+
+    def test_verify_signature_bytes_tampered(self):
+        """Test verifying a tampered in-memory signature document"""
+        identity = SigilIdentity(key_dir=str(self.test_dir), private_key_name=self.key_name)
+        identity._generate_from_seed(self.seed)
+
+        sig_manager = SignatureManager(identity)
+
+        sig_doc = json.loads(sig_manager.create_signature_bytes(hash_hex="a" * 64))
+        sig_doc["claim"]["hash_hex"] = "b" * 64
+
+        is_valid, info = SignatureManager.verify_signature_bytes(json.dumps(sig_doc).encode())
+
+        self.assertFalse(is_valid)
+        self.assertIsNotNone(info["error"])
+
+    def test_verify_unsupported_algorithm(self):
+        """Test that non-Ed25519 documents are rejected"""
+        identity = SigilIdentity(key_dir=str(self.test_dir), private_key_name=self.key_name)
+        identity._generate_from_seed(self.seed)
+
+        sig_manager = SignatureManager(identity)
+
+        sig_doc = json.loads(sig_manager.create_signature_bytes(hash_hex="a" * 64))
+        sig_doc["algorithm"] = "RSA"
 
-class TestConvenienceFunctions(unittest.TestCase):
+        is_valid, info = SignatureManager.verify_signature_bytes(json.dumps(sig_doc).encode())
+
+        self.assertFalse(is_valid)
+        self.assertIn("Unsupported algorithm", info["error"])
+
+    def test_verify_bad_signature_files(self):
+        """Test malformed signature files are rejected with a useful error"""
+        cases = [
+            ("{ invalid json }", "Failed to parse signature"),
+            ('{"signature": "t", "public_key": "t"}', "Missing required fields"),
+            ('{"claim": {"hash_hex": "aa"}, "signature": "t", "public_key": "t"}',
+             "Invalid public key format"),
+        ]
+
+        for bad_input, err_substr in cases:
+            with self.subTest(bad_input=bad_input):
+                self.test_sig_path.write_text(bad_input)
+
+                is_valid, info = SignatureManager.verify_signature_file(self.test_sig_path)
+
+                self.assertFalse(is_valid)
+                self.assertIn(err_substr, info["error"])
+
+
+class TestConvenienceFunctions(TempRootTestCase):
     """Test cases for convenience functions"""
 
     def setUp(self):
-        """Create temporary directory"""
-        self.test_dir = Path(tempfile.mkdtemp())
+        """Create per-test key directory under the shared root"""
+        super().setUp()
         self.key_dir = str(self.test_dir)
 
-    def tearDown(self):
-        """Clean up"""
-        shutil.rmtree(self.test_dir)
-
     def test_create_identity_function(self):
         """Test create_identity() convenience function"""
         key_id = create_identity(key_dir=self.key_dir)
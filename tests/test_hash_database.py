@@ -13,13 +13,11 @@ Tests cover:
 """
 
 import pytest
+import sqlite3
 import tempfile
 import json
 from pathlib import Path
 import numpy as np
-import sys
-
-sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from core.hash_database import HashDatabase
 
@@ -41,7 +39,7 @@ def temp_db():
 @pytest.fixture
 def sample_hash():
     """Create a sample hash for testing"""
-    return np.array([1 if i % 2 == 0 else 0 for i in range(256)])
+    return 1 - (np.arange(256, dtype=np.uint8) & 1)
 
 
 class TestHashDatabaseInit:
@@ -79,10 +77,73 @@ class TestHashDatabaseInit:
         cursor.execute("SELECT name FROM sqlite_master WHERE type='index'")
         indexes = [row[0] for row in cursor.fetchall()]
 
-        assert 'idx_hash' in indexes
+        assert 'idx_hash_bytes' in indexes
+        assert 'idx_hash' not in indexes
         assert 'idx_platform' in indexes
         assert 'idx_key_id' in indexes
 
+    def test_scan_table_tracks_hashes(self, temp_db, sample_hash):
+        """Test that the narrow scan table follows inserts, updates and deletes"""
+        hash_id = temp_db.store_hash(sample_hash, platform="youtube")
+        cursor = temp_db.conn.cursor()
+
+        cursor.execute(
+            '''SELECT s.hash_bytes, p.name FROM hashes_scan s
+               LEFT JOIN platforms p ON p.id = s.platform_id WHERE s.id = ?''',
+            (hash_id,)
+        )
+        hash_bytes, platform = cursor.fetchone()
+        assert len(hash_bytes) == 32
+        assert platform == "youtube"
+
+        # Re-storing with a new platform updates the scan row
+        temp_db.store_hash(sample_hash, platform="tiktok")
+        cursor.execute(
+            '''SELECT p.name FROM hashes_scan s
+               JOIN platforms p ON p.id = s.platform_id WHERE s.id = ?''',
+            (hash_id,)
+        )
+        assert cursor.fetchone()[0] == "tiktok"
+
+        temp_db.delete_hash(hash_id)
+        cursor.execute('SELECT COUNT(*) FROM hashes_scan')
+        assert cursor.fetchone()[0] == 0
+
+    def test_hash_bytes_backfill_migration(self, tmp_path, sample_hash):
+        """Test that legacy rows get a packed hash_bytes value on open"""
+        db_path = tmp_path / "legacy.db"
+        hash_str = ''.join(map(str, sample_hash.astype(int)))
+        hash_hex = hex(int(hash_str, 2))[2:].zfill(64)
+
+        # Legacy schema without hash_bytes
+        conn = sqlite3.connect(str(db_path))
+        conn.execute('''
+            CREATE TABLE hashes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                hash TEXT NOT NULL, hash_hex TEXT NOT NULL, video_id TEXT,
+                platform TEXT, upload_date TEXT, file_path TEXT, frame_count INTEGER,
+                metadata TEXT, created_at TEXT NOT NULL, UNIQUE(hash)
+            )
+        ''')
+        conn.execute(
+            'INSERT INTO hashes (hash, hash_hex, created_at) VALUES (?, ?, ?)',
+            (hash_str, hash_hex, '2025-01-01T00:00:00')
+        )
+        conn.commit()
+        conn.close()
+
+        with HashDatabase(str(db_path)) as db:
+            cursor = db.conn.cursor()
+            cursor.execute('SELECT hash_bytes FROM hashes')
+            assert cursor.fetchone()[0] == bytes.fromhex(hash_hex)
+
+            # Legacy rows are also searchable through the scan table
+            assert len(db.query_similar(sample_hash, threshold=0)) == 1
+
+            # Re-storing a legacy hash updates it in place despite UNIQUE(hash)
+            assert db.store_hash(sample_hash, platform="youtube") == 1
+            assert db.query_similar(sample_hash, threshold=0, platform="youtube")[0]['id'] == 1
+
 
 class TestHashStorage:
     """Test hash storage functionality"""
@@ -149,6 +210,30 @@ class TestHashStorage:
         assert row[1] == "base64_pubkey_here"
         assert row[2] == "sha256_fingerprint"
 
+    def test_store_hashes_batch(self, temp_db, sample_hash):
+        """Test bulk storage returns IDs in order and upserts duplicates"""
+        other_hash = 1 - sample_hash
+
+        ids = temp_db.store_hashes([
+            {'hash_binary': sample_hash, 'video_id': "video1"},
+            {'hash_binary': other_hash, 'platform': "youtube"},
+            {'hash_binary': sample_hash, 'platform': "tiktok"}
+        ])
+
+        assert len(ids) == 3
+        assert ids[0] == ids[2]
+        assert ids[0] != ids[1]
+
+        results = temp_db.query_similar(sample_hash, threshold=0)
+        assert results[0]['video_id'] == "video1"
+        assert results[0]['platform'] == "tiktok"
+
+    def test_store_packed_hash(self, temp_db, sample_hash):
+        """Test a pre-packed 32-byte hash is stored like its bit array"""
+        hash_id = temp_db.store_hash(sample_hash)
+
+        assert temp_db.store_hash(np.packbits(sample_hash)) == hash_id
+
     def test_store_duplicate_hash_updates(self, temp_db, sample_hash):
         """Test that storing duplicate hash updates metadata"""
         # Store initial hash
@@ -165,8 +250,9 @@ class TestHashStorage:
             platform="tiktok"
         )
 
-        # Should return same ID (or different ID but hash exists)
+        # Should return same ID
         assert hash_id2 is not None
+        assert hash_id2 == hash_id1
 
         # Check that only one hash exists
         cursor = temp_db.conn.cursor()
@@ -197,6 +283,18 @@ class TestHashStorage:
         # Verify conversion is correct
         expected_hash_str = ''.join(map(str, sample_hash.astype(int)))
         assert hash_str == expected_hash_str
+        assert hash_hex == hex(int(expected_hash_str, 2))[2:].zfill(64)
+
+    def test_hash_bytes_packed(self, temp_db, sample_hash):
+        """Test hash is also stored as a packed 32-byte blob"""
+        hash_id = temp_db.store_hash(sample_hash)
+
+        cursor = temp_db.conn.cursor()
+        cursor.execute('SELECT hash_bytes, hash_hex FROM hashes WHERE id = ?', (hash_id,))
+        hash_bytes, hash_hex = cursor.fetchone()
+
+        assert len(hash_bytes) == 32
+        assert hash_bytes.hex() == hash_hex
 
 
 class TestHashQuery:
@@ -255,6 +353,14 @@ class TestHashQuery:
         assert len(results) == 1
         assert results[0]['platform'] == "youtube"
 
+    def test_query_platform_added_later(self, temp_db, sample_hash):
+        """Test an unknown platform is picked up once a hash is stored for it"""
+        assert temp_db.query_similar(sample_hash, platform="vimeo") == []
+
+        temp_db.store_hash(sample_hash, platform="vimeo")
+
+        assert len(temp_db.query_similar(sample_hash, platform="vimeo")) == 1
+
     def test_query_result_sorting(self, temp_db, sample_hash):
         """Test that results are sorted by Hamming distance"""
         # Store exact match
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests for hash_kernels module
+
+Tests cover:
+- Bit packing of binary hashes
+- Batched Hamming distance (hardware popcount and lookup-table paths)
+"""
+
+import numpy as np
+import pytest
+
+from core import hash_kernels
+from core.hash_kernels import hamming_batch, pack_hash
+
+
+@pytest.fixture
+def random_hashes():
+    """Create a query hash and a batch of stored hashes"""
+    rng = np.random.default_rng(0)
+    query = rng.integers(0, 2, 256)
+    stored = rng.integers(0, 2, (50, 256))
+    return query, stored
+
+
+class TestPackHash:
+    """Test packing of binary hashes"""
+
+    def test_pack_length(self, random_hashes):
+        """Test 256 bits pack into 32 bytes"""
+        query, _ = random_hashes
+        packed = pack_hash(query)
+
+        assert packed.dtype == np.uint8
+        assert packed.size == 32
+
+    def test_pack_matches_hex(self, random_hashes):
+        """Test packed bytes match the binary string interpretation"""
+        query, _ = random_hashes
+        hash_str = ''.join(map(str, query.astype(int)))
+
+        assert pack_hash(query).tobytes().hex() == hex(int(hash_str, 2))[2:].zfill(64)
+
+    def test_packed_passthrough(self, random_hashes):
+        """Test already-packed uint8 input is returned unchanged"""
+        query, _ = random_hashes
+        packed = pack_hash(query)
+
+        np.testing.assert_array_equal(pack_hash(packed), packed)
+
+
+class TestHammingBatch:
+    """Test batched Hamming distance"""
+
+    def test_matches_elementwise(self, random_hashes):
+        """Test distances match a plain bit-by-bit comparison"""
+        query, stored = random_hashes
+        packed_db = np.stack([pack_hash(row) for row in stored])
+
+        distances = hamming_batch(pack_hash(query), packed_db)
+
+        expected = [int(np.sum(query != row)) for row in stored]
+        assert distances.tolist() == expected
+
+    def test_lookup_table_fallback(self, random_hashes, monkeypatch):
+        """Test the lookup-table path agrees with the popcount path"""
+        query, stored = random_hashes
+        packed_db = np.stack([pack_hash(row) for row in stored])
+        fast = hamming_batch(pack_hash(query), packed_db)
+
+        monkeypatch.setattr(hash_kernels, "_HAS_BITWISE_COUNT", False)
+        fallback = hamming_batch(pack_hash(query), packed_db)
+
+        np.testing.assert_array_equal(fast, fallback)
+
+    def test_empty_batch(self, random_hashes):
+        """Test an empty batch returns no distances"""
+        query, _ = random_hashes
+        distances = hamming_batch(pack_hash(query), np.empty((0, 32), dtype=np.uint8))
+
+        assert distances.shape == (0,)
@@ -49,6 +49,17 @@ class TestSecureSeedUnit:
         # It's statistically nearly impossible for these to match
         assert not np.array_equal(h_default, h_custom), "Custom seed should not collide with default"
 
+    def test_global_rng_untouched(self):
+        """Test that hashing does not reseed NumPy's global RNG"""
+        np.random.seed(1234)
+        expected = np.random.rand(4)
+
+        np.random.seed(1234)
+        compute_perceptual_hash(MOCK_FEATURES, seed=42)
+        actual = np.random.rand(4)
+
+        np.testing.assert_array_equal(expected, actual)
+
 class TestSecureSeedCLI:
     """Integration tests calls the CLI directly"""
     